@@ -10,10 +10,12 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 BACKGROUND_VIDEO  = os.path.join(BASE_DIR, 'assets', 'bacground.mp4')
 FINAL_VIDEO       = os.path.join(BASE_DIR, 'assets', 'ten.mp4')
+# Extracted from BACKGROUND_VIDEO on first run and whenever the video is newer.
+BACKGROUND_AUDIO  = os.path.join(BASE_DIR, 'assets', 'bg_audio.aac')
 
 # ---------- Countdown -------------------------------------------------------
 COUNTDOWN_SECONDS = 30          # 30‑minute show‑open. Change as you wish.
-RESOLUTION        = (1280, 720)      # (width, height)
+RESOLUTION        = (1280, 720)      # (width, height), both even (yuv420p)
 FPS               = 30               # Match the source files
 FONT_FILE         = os.path.join(BASE_DIR, 'assets', 'arialbd.ttf')
 FONT_SIZE         = 96               # px
@@ -23,7 +25,22 @@ FONT_SIZE         = 96               # px
 RTMP_URL          = "rtmps://live-api-s.facebook.com:443/rtmp/FB-705229332491954-0-Ab0-uWMZiS5nWVLw9Fv_LUOo"
 
 VIDEO_BITRATE     = "1000k"
+VIDEO_BUFSIZE     = "2000k"          # CBR rate-control buffer (≈ 2 s at VIDEO_BITRATE)
 AUDIO_BITRATE     = "96k"
 
+# ---------- FFmpeg-native mode ---------------------------------------------
+# True: FFmpeg demuxes the clips itself and burns the countdown in with
+# drawtext (FONT_FILE / FONT_SIZE), so Python never touches a frame.
+# False: frames are decoded and composed in Python and piped to FFmpeg.
+FFMPEG_NATIVE     = False
+
+# ---------- Pipeline --------------------------------------------------------
+HW_DECODE         = True             # try hardware video decoding, fall back to software
+QUEUE_SIZE        = 4                # frames buffered between decode ➜ compose ➜ write
+POOL_SIZE         = 6                # preallocated frames per stage; caps pipeline memory
+WRITE_BATCH       = 2                # frames handed to FFmpeg per writev() call
+PIPE_SIZE         = 1 << 20          # kernel buffer of the FFmpeg stdin pipe (Linux)
+BG_CACHE_MB       = 2048             # keep the letterboxed background in RAM if it fits (0 = off)
+
 # ---------- Preview window --------------------------------------------------
 WINDOW_TITLE      = "⏯  Preview – press ‘q’ to quit"
@@ -0,0 +1,683 @@
+# ========= stream_core.py =========
+"""
+Frame generation, compose/write pipeline and FFmpeg launchers behind Main.py.
+"""
+
+import os
+import sys
+import abc
+import time
+import tempfile
+import queue
+import itertools
+import threading
+import subprocess as sp
+from dataclasses import dataclass
+from pathlib import Path
+
+import cv2
+import numpy as np
+import config as cfg
+
+try:
+    from numba import njit
+except ImportError:  # optional; the overlay falls back to np.copyto
+    njit = None
+
+try:
+    import fcntl
+except ImportError:  # Windows; the FFmpeg pipe keeps its default size
+    fcntl = None
+
+
+# ───── Path Check ─────
+def verify_paths():
+    required = [cfg.BACKGROUND_VIDEO, cfg.FINAL_VIDEO]
+    for p in required:
+        if not Path(p).exists():
+            print(f"[ERROR] Missing file: {p}", file=sys.stderr)
+            sys.exit(1)
+
+    # Re-extract when the background clip is swapped for a newer one.
+    if (not Path(cfg.BACKGROUND_AUDIO).exists()
+            or os.path.getmtime(cfg.BACKGROUND_VIDEO) > os.path.getmtime(cfg.BACKGROUND_AUDIO)):
+        _extract_audio()
+
+
+def _extract_audio():
+    # Demux the soundtrack once so the live FFmpeg can loop it with -c:a copy
+    # instead of re-reading the video container and re-encoding every loop.
+    print(f"[Setup] Extracting audio ➜ {cfg.BACKGROUND_AUDIO}")
+    tmp = f"{cfg.BACKGROUND_AUDIO}.part"
+    base = ["ffmpeg", "-loglevel", "error", "-y", "-i", str(cfg.BACKGROUND_VIDEO), "-vn"]
+    for codec in (["-c:a", "copy"], ["-c:a", "aac", "-b:a", cfg.AUDIO_BITRATE]):
+        if sp.run([*base, *codec, "-f", "adts", tmp]).returncode == 0:
+            os.replace(tmp, cfg.BACKGROUND_AUDIO)
+            return
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    print(f"[ERROR] Could not extract audio from {cfg.BACKGROUND_VIDEO}", file=sys.stderr)
+    sys.exit(1)
+
+
+# ───── Frame Utils ─────
+# Countdown font metrics depend only on the output height. Hershey digits share
+# one advance width, so every "mm:ss" string measures the same as "00:00".
+SCALE = cfg.RESOLUTION[1] / 720 * 2.6
+THICK = max(2, int(cfg.RESOLUTION[1] / 720 * 3))
+TEXT_EXTENTS = cv2.getTextSize("00:00", cv2.FONT_HERSHEY_SIMPLEX, SCALE, THICK)[0]
+# Every label the countdown can show, indexed by secs_left.
+TEXT_STRINGS: list[str] = [f"{i // 60:02}:{i % 60:02}" for i in range(cfg.COUNTDOWN_SECONDS + 1)]
+
+# secs_left ➜ (sprite_bgr, mask, (x, y, w, h)); the text only changes once a second.
+TEXT_CACHE: dict[int, tuple[np.ndarray, np.ndarray, tuple]] = {}
+
+
+def _render_countdown_sprite(secs_left: int, w: int, h: int) -> tuple[np.ndarray, np.ndarray, tuple]:
+    text = TEXT_STRINGS[secs_left]
+    scale, thick = SCALE, THICK
+    tw, th = TEXT_EXTENTS
+
+    x = (w - tw) // 2
+    y = (h + th) // 2
+    pad = int(h * 0.02)
+
+    # Sprite covers the box plus a margin for anti-aliased glyph edges.
+    x0 = max(0, x - pad - thick)
+    y0 = max(0, y - th - pad - thick)
+    x1 = min(w, x + tw + pad + thick + 1)
+    y1 = min(h, y + pad + thick + 1)
+
+    sprite = np.zeros((y1 - y0, x1 - x0, 3), np.uint8)
+    alpha = np.zeros((y1 - y0, x1 - x0), np.uint8)
+    org = (x - x0, y - y0)
+    top_left = (x - pad - x0, y - th - pad - y0)
+    bottom_right = (x + tw + pad - x0, y + pad - y0)
+
+    cv2.rectangle(sprite, top_left, bottom_right, (0, 0, 0), -1)
+    cv2.putText(sprite, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, (255, 255, 255), thick, cv2.LINE_AA)
+    # Alpha channel: the black box is opaque too, so coverage can't be read off the BGR pixels.
+    cv2.rectangle(alpha, top_left, bottom_right, 255, -1)
+    cv2.putText(alpha, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, 255, thick, cv2.LINE_AA)
+
+    return sprite, alpha > 0, (x0, y0, x1 - x0, y1 - y0)
+
+
+if njit is not None:
+    # Serial on purpose: the sprite is tiny, and parallel=True called from the
+    # compose thread can leave Numba's TBB pool blocking interpreter exit.
+    @njit(cache=True)
+    def blit_masked(dst, sprite, mask, x, y):
+        for i in range(sprite.shape[0]):
+            for j in range(sprite.shape[1]):
+                if mask[i, j]:
+                    dst[y + i, x + j, 0] = sprite[i, j, 0]
+                    dst[y + i, x + j, 1] = sprite[i, j, 1]
+                    dst[y + i, x + j, 2] = sprite[i, j, 2]
+else:
+    def blit_masked(dst, sprite, mask, x, y):
+        h, w = mask.shape
+        np.copyto(dst[y:y + h, x:x + w], sprite, where=mask[..., None])
+
+
+def _warm_blit():
+    """Compile blit_masked now, on the same argument types the compose thread passes."""
+    if njit is not None:
+        blit_masked(np.zeros((1, 1, 3), np.uint8), np.zeros((1, 1, 3), np.uint8),
+                    np.zeros((1, 1), np.bool_), 0, 0)
+
+
+def draw_centered_countdown(frame: np.ndarray, secs_left: int) -> np.ndarray:
+    entry = TEXT_CACHE.get(secs_left)
+    if entry is None:
+        h, w = frame.shape[:2]
+        entry = TEXT_CACHE[secs_left] = _render_countdown_sprite(secs_left, w, h)
+
+    sprite, mask, (x, y, _, _) = entry
+    blit_masked(frame, sprite, mask, x, y)
+    return frame
+
+
+class BufferPool:
+    """Fixed set of preallocated frames recycled between pipeline stages."""
+
+    def __init__(self, shape: tuple, size: int):
+        self.shape = shape
+        self._free = queue.Queue()
+        # The arrays themselves, not id()s: ids of freed arrays get reused.
+        self._owned = [np.zeros(shape, np.uint8) for _ in range(size)]
+        for buf in self._owned:
+            self._free.put(buf)
+
+    def acquire(self, stop: threading.Event):
+        return _get(self._free, stop)
+
+    def release(self, buf: np.ndarray):
+        # Foreign arrays (OpenCV reallocations, cached frames) are ignored.
+        if any(b is buf for b in self._owned):
+            self._free.put(buf)
+
+
+@dataclass
+class LetterboxCtx:
+    frames: BufferPool    # decoded source frames
+    canvases: BufferPool  # letterboxed output, borders zeroed once
+    roi_slice: tuple
+    new_w: int
+    new_h: int
+    interp: int | None    # None: source is already ROI-sized, copy as-is
+
+
+def make_letterbox_ctx(src_w: int, src_h: int, target_w: int, target_h: int,
+                       pool_size: int = 1) -> LetterboxCtx:
+    tgt_ar, src_ar = target_w / target_h, src_w / src_h
+
+    if src_ar > tgt_ar:
+        new_w = target_w
+        new_h = int(src_h * target_w / src_w)
+    else:
+        new_h = target_h
+        new_w = int(src_w * target_h / src_h)
+
+    pad_x = (target_w - new_w) // 2
+    pad_y = (target_h - new_h) // 2
+    frames = BufferPool((src_h, src_w, 3), pool_size)
+    canvases = BufferPool((target_h, target_w, 3), pool_size)
+    roi = (slice(pad_y, pad_y + new_h), slice(pad_x, pad_x + new_w))
+
+    # Bilinear is OpenCV's SIMD fast path; INTER_AREA costs ~5x more and is only
+    # worth it when shrinking by 2x or more, where bilinear starts to alias.
+    if (new_w, new_h) == (src_w, src_h):
+        interp = None
+    elif new_w * 2 <= src_w:
+        interp = cv2.INTER_AREA
+    else:
+        interp = cv2.INTER_LINEAR
+    return LetterboxCtx(frames, canvases, roi, new_w, new_h, interp)
+
+
+def capture_letterbox_ctx(cap: cv2.VideoCapture, target_w: int, target_h: int,
+                          pool_size: int = 1) -> LetterboxCtx:
+    src_w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    src_h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    return make_letterbox_ctx(src_w, src_h, target_w, target_h, pool_size)
+
+
+def letterbox_into(frame: np.ndarray, ctx: LetterboxCtx, canvas: np.ndarray) -> np.ndarray:
+    # Borders were zeroed when the canvas was allocated; only the ROI changes.
+    roi = canvas[ctx.roi_slice]
+    if ctx.interp is None:
+        np.copyto(roi, frame)
+    else:
+        cv2.resize(frame, (ctx.new_w, ctx.new_h), dst=roi, interpolation=ctx.interp)
+    return canvas
+
+
+# ───── Frame Generator ─────
+def _open_capture(path) -> cv2.VideoCapture:
+    # VIDEO_ACCELERATION_ANY lets the FFmpeg backend use a hardware decoder
+    # (VAAPI, D3D11, …) when one exists and silently stays in software otherwise.
+    if cfg.HW_DECODE and hasattr(cv2, "CAP_PROP_HW_ACCELERATION"):
+        cap = cv2.VideoCapture(str(path), cv2.CAP_FFMPEG,
+                               [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+        if cap.isOpened():
+            return cap
+        cap.release()
+    return cv2.VideoCapture(str(path))
+
+
+def _read_into(cap: cv2.VideoCapture, pool: BufferPool, stop: threading.Event):
+    """Decode the next frame into a pooled buffer: (ok, frame), or None once stopped."""
+    buf = pool.acquire(stop)
+    if buf is None:
+        return None
+    ok, frame = cap.read(buf)
+    if not ok or frame is not buf:
+        pool.release(buf)
+    return ok, frame
+
+
+class _FrameClock:
+    """Monotonic frame-count schedule: frame n is due at start + n / fps."""
+
+    def __init__(self, fps: int):
+        self.period = 1 / fps
+        self.start, self.count = time.perf_counter(), 0
+
+    def wait(self, frames: int = 1):
+        # Deadlines come from the frame count, so sleep jitter never accumulates.
+        delay = self.start + self.count * self.period - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        elif delay < -1.0:  # long stall: re-anchor instead of bursting to catch up
+            self.start, self.count = time.perf_counter(), 0
+        self.count += frames
+
+
+def _cached_ctx(tgt_w: int, tgt_h: int) -> LetterboxCtx:
+    # BG_FRAMES are already letterboxed and shared by every cycle: they are
+    # copied onto a pooled canvas as-is and never handed back to a pool.
+    full = (slice(0, tgt_h), slice(0, tgt_w))
+    return LetterboxCtx(BufferPool((tgt_h, tgt_w, 3), 0),
+                        BufferPool((tgt_h, tgt_w, 3), cfg.POOL_SIZE),
+                        full, tgt_w, tgt_h, None)
+
+
+def _background_frames(stop: threading.Event):
+    """Endless (frame, letterbox_ctx) stream of the background clip, from RAM when cached."""
+    tgt_w, tgt_h = cfg.RESOLUTION
+
+    if BG_FRAMES:
+        for frame in itertools.cycle(BG_FRAMES):
+            yield frame, BG_CTX
+        return
+
+    bg_cap = _open_capture(cfg.BACKGROUND_VIDEO)
+    bg_ctx = capture_letterbox_ctx(bg_cap, tgt_w, tgt_h, cfg.POOL_SIZE)
+    try:
+        while True:
+            if (res := _read_into(bg_cap, bg_ctx.frames, stop)) is None:
+                return
+            ok, frame = res
+            if not ok:
+                bg_cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                continue
+            yield frame, bg_ctx
+    finally:
+        bg_cap.release()
+
+
+def countdown_and_final_frames(cycle_secs: int, stop: threading.Event):
+    """Yield raw (frame, letterbox_ctx, secs_left) tuples; secs_left is None for the sting.
+
+    Frames come from ``letterbox_ctx.frames`` and must be released there once consumed.
+    """
+    tgt_w, tgt_h = cfg.RESOLUTION
+
+    while True:
+        # Countdown video loop
+        background = _background_frames(stop)
+        try:
+            for frame_idx, (frame, bg_ctx) in enumerate(background):
+                # Clock runs on output frames, so stalls never skip or repeat a second.
+                left = cycle_secs - frame_idx // cfg.FPS
+                yield frame, bg_ctx, left
+
+                if left <= 10:
+                    break
+        finally:
+            background.close()
+        if stop.is_set():
+            return
+
+        # Final sting video once
+        fin_cap = _open_capture(cfg.FINAL_VIDEO)
+        fin_ctx = capture_letterbox_ctx(fin_cap, tgt_w, tgt_h, cfg.POOL_SIZE)
+        try:
+            while True:
+                if (res := _read_into(fin_cap, fin_ctx.frames, stop)) is None:
+                    return
+                ok, frame = res
+                if not ok:
+                    break
+                yield frame, fin_ctx, None
+        finally:
+            fin_cap.release()
+
+
+# ───── Background Cache ─────
+# The whole background clip, letterboxed, when it fits in BG_CACHE_MB.
+BG_FRAMES: list[np.ndarray] = []
+# Built alongside BG_FRAMES and shared by every cycle and reconnect.
+BG_CTX: LetterboxCtx | None = None
+
+
+def _preload_background():
+    global BG_CTX
+    if BG_FRAMES:
+        return
+    tgt_w, tgt_h = cfg.RESOLUTION
+    limit = cfg.BG_CACHE_MB * 2**20 // (tgt_w * tgt_h * 3)
+    if limit == 0:
+        return
+
+    cap = _open_capture(cfg.BACKGROUND_VIDEO)
+    try:
+        if not 0 < cap.get(cv2.CAP_PROP_FRAME_COUNT) <= limit:
+            print("[Setup] Background clip too long to cache; decoding live")
+            return
+        # Geometry only: frames are decoded into `buf` and letterboxed onto fresh arrays.
+        ctx = make_letterbox_ctx(int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                                 int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)), tgt_w, tgt_h, 0)
+        frames, buf = [], None
+        while True:
+            ok, buf = cap.read(buf)
+            if not ok:
+                break
+            if len(frames) == limit:  # frame count metadata was off
+                print("[Setup] Background clip too long to cache; decoding live")
+                return
+            frames.append(letterbox_into(buf, ctx, np.zeros((tgt_h, tgt_w, 3), np.uint8)))
+    finally:
+        cap.release()
+
+    BG_FRAMES.extend(frames)
+    BG_CTX = _cached_ctx(tgt_w, tgt_h)
+    print(f"[Setup] Cached {len(frames)} background frames")
+
+
+# ───── Pipeline Stages ─────
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q: queue.Queue, stop: threading.Event):
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return None
+
+
+class _Stage(threading.Thread, abc.ABC):
+    """Pipeline thread; any failure is recorded and stops the whole pipeline."""
+
+    def __init__(self, stop: threading.Event):
+        super().__init__(name=type(self).__name__, daemon=True)
+        self.stop = stop
+        self.error = None
+
+    def run(self):
+        try:
+            self._run()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.stop.set()
+
+    @abc.abstractmethod
+    def _run(self):
+        """Stage body, run on the thread; return once ``stop`` is set."""
+
+
+class DecodeThread(_Stage):
+    def __init__(self, out_q: queue.Queue, stop: threading.Event, cycle_secs: int):
+        super().__init__(stop)
+        self.out_q = out_q
+        self.cycle_secs = cycle_secs
+
+    def _run(self):
+        frames = countdown_and_final_frames(self.cycle_secs, self.stop)
+        try:
+            for item in frames:
+                if not _put(self.out_q, item, self.stop):
+                    return
+        finally:
+            frames.close()
+
+
+class ComposeThread(_Stage):
+    def __init__(self, in_q: queue.Queue, out_q: queue.Queue, stop: threading.Event):
+        super().__init__(stop)
+        self.in_q = in_q
+        self.out_q = out_q
+
+    def _run(self):
+        while (item := _get(self.in_q, self.stop)) is not None:
+            frame, ctx, left = item
+            if (canvas := ctx.canvases.acquire(self.stop)) is None:
+                return
+            # The cached background's pool outlives this pipeline: never leak a canvas.
+            try:
+                letterbox_into(frame, ctx, canvas)
+                ctx.frames.release(frame)
+                if left is not None:
+                    draw_centered_countdown(canvas, left)
+            except:
+                ctx.canvases.release(canvas)
+                raise
+            if not _put(self.out_q, (canvas, ctx), self.stop):
+                ctx.canvases.release(canvas)
+                return
+
+
+def _writev_all(fd: int, views: list):
+    # writev may stop short (signals, huge batches); resume mid-buffer.
+    views = list(views)
+    while views:
+        n = os.writev(fd, views)
+        while views and n >= len(views[0]):
+            n -= len(views.pop(0))
+        if n:
+            views[0] = views[0][n:]
+
+
+class WriterThread(_Stage):
+    def __init__(self, in_q: queue.Queue, sink, stop: threading.Event):
+        super().__init__(stop)
+        self.in_q = in_q
+        self.sink = sink
+        w, h = cfg.RESOLUTION
+        # Planar I420 is half the size of BGR24 and is what libx264 encodes natively.
+        # One buffer per frame in a batch, since a batch is sent in one syscall.
+        self.yuv = [np.empty((h * 3 // 2, w), np.uint8) for _ in range(cfg.WRITE_BATCH)]
+        self.views = [memoryview(buf).cast("B") for buf in self.yuv]
+
+    def _run(self):
+        fd = self.sink.fileno() if hasattr(os, "writev") else None
+        pending = 0
+        clock = _FrameClock(cfg.FPS)
+        while (item := _get(self.in_q, self.stop)) is not None:
+            canvas, ctx = item
+            try:
+                cv2.cvtColor(canvas, cv2.COLOR_BGR2YUV_I420, dst=self.yuv[pending])
+            finally:
+                ctx.canvases.release(canvas)
+            pending += 1
+
+            if pending < cfg.WRITE_BATCH:
+                continue
+
+            # Pace output to FPS even if upstream delivers in bursts.
+            clock.wait(pending)
+            if fd is None:  # no writev (Windows); raw pipe writes may be partial
+                for view in self.views:
+                    while view:
+                        view = view[self.sink.write(view):]
+            else:
+                _writev_all(fd, self.views)
+            pending = 0
+
+
+# ───── FFmpeg Stream ─────
+def _output_args() -> list:
+    return [
+        "-map", "0:v:0",
+        "-map", "1:a:0",
+        "-c:v", "libx264",
+        "-preset", "veryfast",
+        # No lookahead or B-frames: frames leave the encoder as soon as they arrive.
+        "-tune", "zerolatency",
+        "-g", str(cfg.FPS * 2),
+        "-keyint_min", str(cfg.FPS * 2),
+        "-x264-params", "nal-hrd=cbr:bframes=0:rc-lookahead=0:sync-lookahead=0",
+        "-b:v", cfg.VIDEO_BITRATE,
+        "-maxrate", cfg.VIDEO_BITRATE,
+        "-bufsize", cfg.VIDEO_BUFSIZE,
+        "-pix_fmt", "yuv420p",
+        "-c:a", "copy",
+        "-f", "flv",
+        cfg.RTMP_URL,
+    ]
+
+
+def _start_ffmpeg() -> sp.Popen:
+    w, h = cfg.RESOLUTION
+    cmd = [
+        "ffmpeg",
+        "-loglevel", "error",
+        "-f", "rawvideo",
+        "-pix_fmt", "yuv420p",
+        "-s", f"{w}x{h}",
+        "-r", str(cfg.FPS),
+        "-fflags", "+nobuffer",
+        "-flags", "+low_delay",
+        "-i", "-",
+        "-stream_loop", "-1",
+        "-i", str(cfg.BACKGROUND_AUDIO),
+        *_output_args(),
+    ]
+    # Unbuffered: frames go straight to the pipe fd via writev, so the size
+    # that matters is the kernel pipe's (64 KB by default on Linux).
+    ffmpeg = sp.Popen(cmd, stdin=sp.PIPE, bufsize=0)
+    _grow_pipe(ffmpeg.stdin.fileno(), cfg.PIPE_SIZE)
+    return ffmpeg
+
+
+def _grow_pipe(fd: int, size: int):
+    if fcntl is None:
+        return
+    try:
+        fcntl.fcntl(fd, getattr(fcntl, "F_SETPIPE_SZ", 1031), size)
+    except OSError as e:  # above /proc/sys/fs/pipe-max-size, or not Linux
+        print(f"[Warn] Could not resize FFmpeg pipe: {e}", file=sys.stderr)
+
+
+# ───── FFmpeg-native Stream ─────
+def _clip_seconds(path) -> float:
+    # Container duration: what concat and -stream_loop advance by. The frame
+    # count / fps estimate differs by a few ms and would drift every cycle.
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        str(path),
+    ]
+    return float(sp.run(cmd, capture_output=True, text=True, check=True).stdout)
+
+
+def _write_playlist(countdown_secs: float) -> str:
+    """Concat playlist for one cycle: background clip(s) trimmed to the countdown, then the sting."""
+    def entry(path) -> str:
+        return "file '" + str(path).replace("'", "'\\''") + "'"
+
+    bg_secs = _clip_seconds(cfg.BACKGROUND_VIDEO)
+    lines, remaining = [], countdown_secs
+    while remaining > 0:
+        lines.append(entry(cfg.BACKGROUND_VIDEO))
+        if remaining < bg_secs:
+            lines.append(f"outpoint {remaining:.3f}")
+        remaining -= bg_secs
+    lines.append(entry(cfg.FINAL_VIDEO))
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write("\n".join(lines) + "\n")
+    return f.name
+
+
+def _countdown_filter(cycle_secs: int, countdown_secs: float, period: float) -> str:
+    w, h = cfg.RESOLUTION
+    # Same countdown as the Python path, derived from the output timestamp.
+    left = f"({cycle_secs}-trunc(mod(t\\,{period:.3f})))"
+    text = f"%{{eif\\:trunc({left}/60)\\:d\\:2}}\\:%{{eif\\:mod({left}\\,60)\\:d\\:2}}"
+    font = str(cfg.FONT_FILE).replace("\\", "/").replace(":", "\\:")
+    return ",".join([
+        f"scale={w}:{h}:force_original_aspect_ratio=decrease",
+        f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2",
+        "setsar=1",
+        f"fps={cfg.FPS}",
+        f"drawtext=fontfile='{font}':text='{text}'"
+        f":fontsize={int(cfg.FONT_SIZE * h / 720)}:fontcolor=white"
+        f":box=1:boxcolor=black:boxborderw={int(h * 0.02)}"
+        f":x=(w-tw)/2:y=(h-th)/2"
+        f":enable='lt(mod(t\\,{period:.3f})\\,{countdown_secs:.3f})'",
+    ])
+
+
+def _start_native_ffmpeg(playlist: str, vf: str) -> sp.Popen:
+    cmd = [
+        "ffmpeg",
+        "-loglevel", "error",
+        "-re",
+        "-stream_loop", "-1",
+        "-f", "concat",
+        "-safe", "0",
+        "-i", playlist,
+        "-stream_loop", "-1",
+        "-i", str(cfg.BACKGROUND_AUDIO),
+        "-vf", vf,
+        *_output_args(),
+    ]
+    return sp.Popen(cmd)
+
+
+def run_native_stream():
+    print("[Stream] Connecting to RTMP (FFmpeg-native)…")
+    retry_delay = 5
+
+    # The Python path switches to the sting once 10 s are left on the clock.
+    countdown_secs = cfg.COUNTDOWN_SECONDS - 10
+    period = countdown_secs + _clip_seconds(cfg.FINAL_VIDEO)
+    playlist = _write_playlist(countdown_secs)
+    vf = _countdown_filter(cfg.COUNTDOWN_SECONDS, countdown_secs, period)
+
+    try:
+        while True:
+            ffmpeg = _start_native_ffmpeg(playlist, vf)
+            print("[Stream] ➜ live")
+            code = ffmpeg.wait()
+            print(f"[Warn] FFmpeg exited with code {code}. Reconnecting in {retry_delay}s…")
+            time.sleep(retry_delay)
+    finally:
+        os.remove(playlist)
+
+
+# ───── Main Stream Loop ─────
+def run_stream():
+    _preload_background()
+    # A fresh checkout has no Numba cache; compiling on the first countdown
+    # frame would stall the pipeline right after FFmpeg connects.
+    _warm_blit()
+    print("[Stream] Connecting to RTMP…")
+    retry_delay = 5
+
+    while True:
+        ffmpeg = _start_ffmpeg()
+        print("[Stream] ➜ live")
+
+        stop = threading.Event()
+        raw_q = queue.Queue(maxsize=cfg.QUEUE_SIZE)
+        out_q = queue.Queue(maxsize=cfg.QUEUE_SIZE)
+        stages = [
+            DecodeThread(raw_q, stop, cfg.COUNTDOWN_SECONDS),
+            ComposeThread(raw_q, out_q, stop),
+            WriterThread(out_q, ffmpeg.stdin, stop),
+        ]
+        for t in stages:
+            t.start()
+
+        stop.wait()
+        # Kill FFmpeg first so a writer blocked on a full pipe is released.
+        ffmpeg.terminate()
+        for t in stages:
+            t.join()
+        # Return undelivered canvases: the cached background's pool outlives this pipeline.
+        while not out_q.empty():
+            canvas, ctx = out_q.get_nowait()
+            ctx.canvases.release(canvas)
+
+        e = next((t.error for t in stages if t.error is not None), "pipeline stopped")
+        print(f"[Warn] {e}. Reconnecting in {retry_delay}s…")
+        try:
+            ffmpeg.stdin.close()
+        except:
+            pass
+        time.sleep(retry_delay)